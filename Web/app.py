@@ -2,6 +2,7 @@ from datetime import datetime
 from flask import Flask, jsonify, request, render_template
 import pandas as pd
 from make_images import make_images
+from station_index import build_station_index, select_stations
 import os
 
 app = Flask(__name__)
@@ -9,6 +10,12 @@ app = Flask(__name__)
 # Load CSV data
 data = pd.read_csv('../forecast.csv')  # Ensure this file exists and is correctly formatted
 
+# Build the spatial index over station coordinates once at startup
+STATION_INDEX = build_station_index('station_metadata.csv')
+
+# Group forecast rows by station once, so location searches only touch candidate stations
+STATION_GROUPS = dict(tuple(data.groupby('station_id', sort=False))) if 'station_id' in data.columns else {}
+
 @app.route('/')
 def index():
     """Render the main page."""
@@ -44,22 +51,37 @@ def get_predictions():
         if not required_columns.issubset(data.columns):
             raise ValueError("Dataset does not have the required columns.")
 
-        # Convert `ds` to full_date in the main dataset
-        data['full_date'] = pd.to_datetime(f"{datetime.now().year}-" + data['ds'], format="%Y-%m-%d")
+        # Prune candidate stations by location before searching for windows
+        candidate_stations = select_candidate_stations(data_json)
+        if candidate_stations is None:
+            station_data = data
+        else:
+            candidate_groups = [STATION_GROUPS[s] for s in candidate_stations if s in STATION_GROUPS]
+            if not candidate_groups:
+                return jsonify({
+                    'message': "No stations found near the selected location.",
+                    'html': "No matches available.",
+                    'outfit_suggestion': "No outfit suggestion available.",
+                    'graphs': []
+                })
+            station_data = pd.concat(candidate_groups)
+
+        # Convert `ds` to full_date in the candidate dataset
+        station_data['full_date'] = pd.to_datetime(f"{datetime.now().year}-" + station_data['ds'], format="%Y-%m-%d")
 
         # Adjust for multi-year date ranges
         if start_date.year > datetime.now().year or end_date.year > datetime.now().year:
-            data['full_date'] = pd.to_datetime(f"{end_date.year}-" + data['ds'], format="%Y-%m-%d")
+            station_data['full_date'] = pd.to_datetime(f"{end_date.year}-" + station_data['ds'], format="%Y-%m-%d")
 
         # Filter data for the selected date range
-        vacation_data = data[
-            (data['full_date'] >= start_date) &
-            (data['full_date'] <= end_date)
+        vacation_data = station_data[
+            (station_data['full_date'] >= start_date) &
+            (station_data['full_date'] <= end_date)
         ].copy()
 
         # If no data in the selected range, suggest 3 closest dates outside the range
         if vacation_data.empty:
-            return suggest_alternative_dates(data, start_date, end_date, wave_height, num_days)
+            return suggest_alternative_dates(station_data, start_date, end_date, wave_height, num_days)
 
         # Find the best `num_days` vacation windows
         response = suggest_vacation_windows(vacation_data, wave_height, num_days)
@@ -111,6 +133,21 @@ def get_predictions():
     except Exception as e:
         return jsonify({'error': f"Unexpected Error: {str(e)}"}), 500
 
+def select_candidate_stations(data_json):
+    """
+    Select the stations to search based on the optional location filters
+    (`location` or `latitude`/`longitude`, with `radius_km` and/or `nearest_k`).
+    Returns None when no location filter is given, meaning every station is a candidate.
+    """
+    return select_stations(
+        STATION_INDEX,
+        location=data_json.get('location'),
+        latitude=data_json.get('latitude'),
+        longitude=data_json.get('longitude'),
+        radius_km=data_json.get('radius_km'),
+        nearest_k=data_json.get('nearest_k')
+    )
+
 def get_outfit_suggestion(temp):
     """
     Suggest a surfing outfit based on the water temperature.
@@ -0,0 +1,170 @@
+import math
+import re
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def build_station_index(metadata_file):
+    """
+    Build a spatial index over the buoy stations listed in the metadata file.
+
+    Parameters:
+    - metadata_file: Path to a CSV file with `station_id`, `latitude` and `longitude` columns.
+
+    Returns:
+    - A dict with the station table (`stations`) and a haversine BallTree (`tree`)
+      built on the station coordinates in radians.
+    """
+    stations = pd.read_csv(metadata_file)
+
+    required_columns = {'station_id', 'latitude', 'longitude'}
+    if not required_columns.issubset(stations.columns):
+        raise ValueError("Station metadata does not have the required columns.")
+
+    stations = stations.dropna(subset=['latitude', 'longitude']).reset_index(drop=True)
+    coords = np.radians(stations[['latitude', 'longitude']].to_numpy(dtype=float))
+    tree = BallTree(coords, metric='haversine')
+
+    return {'stations': stations, 'tree': tree}
+
+
+def normalize_location_name(name):
+    """
+    Lowercase a location name and drop whitespace, `_` and `-`,
+    so that "New York" matches the `NewYork` station prefix.
+    """
+    return re.sub(r'[\s_\-]+', '', name).lower()
+
+
+def find_station_location(station_index, location):
+    """
+    Look up the coordinates of a station by its full id (e.g. `Miami_VAKF1`)
+    or by its location prefix (e.g. `Miami`, `New York`).
+
+    Returns:
+    - A (latitude, longitude) tuple.
+    """
+    stations = station_index['stations']
+    name = normalize_location_name(location)
+    if not name:
+        raise ValueError("Location must not be blank.")
+
+    full_ids = stations['station_id'].map(normalize_location_name)
+    prefixes = stations['station_id'].str.split('_').str[0].map(normalize_location_name)
+    matches = stations[(full_ids == name) | (prefixes == name)]
+    if matches.empty:
+        raise ValueError(f"Unknown location: {location}.")
+
+    # Several stations may share a location name; use their midpoint
+    return matches['latitude'].mean(), matches['longitude'].mean()
+
+
+def find_nearby_stations(station_index, latitude, longitude, radius_km=None, nearest_k=None):
+    """
+    Find the stations around a point, closest first.
+
+    Parameters:
+    - station_index: Index returned by `build_station_index`.
+    - latitude, longitude: Coordinates of the search point in degrees.
+    - radius_km: Only keep stations within this great-circle distance.
+    - nearest_k: Only keep the `nearest_k` closest stations.
+
+    Returns:
+    - A list of (station_id, distance_km) tuples sorted by distance.
+    """
+    stations = station_index['stations']
+    tree = station_index['tree']
+    point = np.radians([[latitude, longitude]])
+
+    if nearest_k is not None:
+        k = min(nearest_k, len(stations))
+        distances, indices = tree.query(point, k=k)
+    elif radius_km is not None:
+        indices, distances = tree.query_radius(
+            point, r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True
+        )
+    else:
+        raise ValueError("Either radius_km or nearest_k must be provided.")
+
+    nearby = []
+    for idx, dist in zip(indices[0], distances[0]):
+        distance_km = dist * EARTH_RADIUS_KM
+        if radius_km is not None and distance_km > radius_km:
+            continue
+        nearby.append((stations.iloc[idx]['station_id'], distance_km))
+
+    return nearby
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _to_number(value, name, cast=float):
+    """
+    Convert a request value to a finite number, raising ValueError for anything else.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number.")
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number.")
+    if cast is int:
+        if not number.is_integer():
+            raise ValueError(f"{name} must be a whole number.")
+        return int(number)
+    return number
+
+
+def select_stations(station_index, location=None, latitude=None, longitude=None,
+                    radius_km=None, nearest_k=None):
+    """
+    Select the stations to search from raw (request) location filters.
+
+    The search point is either `latitude`/`longitude` or a `location` name
+    (e.g. "Miami"). `radius_km` keeps stations within that distance and
+    `nearest_k` keeps only the k closest ones; at least one of them is
+    required once a search point is given, and vice versa.
+
+    Returns:
+    - None when no location filter is given, meaning every station is a candidate,
+      otherwise a list of station ids sorted by distance.
+    """
+    has_coords = not _is_blank(latitude) or not _is_blank(longitude)
+    if not _is_blank(location) and not isinstance(location, str):
+        raise ValueError("Location must be a string.")
+    has_point = has_coords or not _is_blank(location)
+
+    radius_km = None if _is_blank(radius_km) else _to_number(radius_km, "radius_km")
+    nearest_k = None if _is_blank(nearest_k) else _to_number(nearest_k, "nearest_k", cast=int)
+    has_limit = radius_km is not None or nearest_k is not None
+
+    if not has_point and not has_limit:
+        return None
+    if not has_limit:
+        raise ValueError("A location search needs radius_km or nearest_k.")
+    if not has_point:
+        raise ValueError("A location or latitude and longitude must be provided for a radius or nearest search.")
+    if radius_km is not None and radius_km <= 0:
+        raise ValueError("Radius must be a positive number of kilometers.")
+    if nearest_k is not None and nearest_k < 1:
+        raise ValueError("Number of nearest stations must be at least 1.")
+
+    if has_coords:
+        if _is_blank(latitude) or _is_blank(longitude):
+            raise ValueError("Both latitude and longitude must be provided.")
+        latitude = _to_number(latitude, "latitude")
+        longitude = _to_number(longitude, "longitude")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError("Latitude or longitude is out of range.")
+    else:
+        latitude, longitude = find_station_location(station_index, location)
+
+    nearby = find_nearby_stations(station_index, latitude, longitude, radius_km, nearest_k)
+    return [station_id for station_id, _ in nearby]
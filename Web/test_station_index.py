@@ -0,0 +1,95 @@
+import os
+import pytest
+from station_index import build_station_index, find_station_location, find_nearby_stations, select_stations
+
+METADATA_FILE = os.path.join(os.path.dirname(__file__), 'station_metadata.csv')
+
+
+@pytest.fixture(scope='module')
+def station_index():
+    return build_station_index(METADATA_FILE)
+
+
+def test_radius_around_miami(station_index):
+    stations = select_stations(station_index, location='Miami', radius_km=500)
+    assert stations == ['Miami_VAKF1', 'Orlando_41113', 'WestTampa_42098']
+
+
+def test_nearest_k_caps_count(station_index):
+    stations = select_stations(station_index, location='Miami', nearest_k=2)
+    assert stations == ['Miami_VAKF1', 'Orlando_41113']
+
+
+def test_radius_and_nearest_k_combined(station_index):
+    # k alone would include WestTampa (~344 km); the radius drops it
+    assert select_stations(station_index, location='Miami', radius_km=300, nearest_k=5) == [
+        'Miami_VAKF1', 'Orlando_41113'
+    ]
+    # the radius alone would include three stations; k keeps one
+    assert select_stations(station_index, location='Miami', radius_km=500, nearest_k=1) == ['Miami_VAKF1']
+
+
+def test_location_names_are_normalized(station_index):
+    assert find_station_location(station_index, 'New York') == find_station_location(station_index, 'NewYork')
+    for name in ['san diego', 'Los-Angeles', 'north_carolina', 'Puerto Rico', 'miami_vakf1']:
+        find_station_location(station_index, name)
+
+
+@pytest.mark.parametrize('location', ['Atlantis', '', '   '])
+def test_unknown_or_blank_location_raises(station_index, location):
+    with pytest.raises(ValueError):
+        find_station_location(station_index, location)
+
+
+def test_unknown_location_search_raises(station_index):
+    with pytest.raises(ValueError):
+        select_stations(station_index, location='Atlantis', radius_km=500)
+
+
+def test_no_filter_returns_none(station_index):
+    assert select_stations(station_index, location='', latitude='', longitude='', radius_km='', nearest_k='') is None
+
+
+@pytest.mark.parametrize('point', [
+    {'location': 'Miami'},
+    {'latitude': 25.7, 'longitude': -80.2},
+])
+def test_location_without_limit_is_rejected(station_index, point):
+    with pytest.raises(ValueError, match='radius_km or nearest_k'):
+        select_stations(station_index, **point)
+
+
+def test_limit_without_location_is_rejected(station_index):
+    with pytest.raises(ValueError):
+        select_stations(station_index, radius_km=500)
+
+
+@pytest.mark.parametrize('filters', [
+    {'radius_km': float('nan')},
+    {'radius_km': 'nan'},
+    {'radius_km': float('inf')},
+    {'radius_km': [1]},
+    {'radius_km': -5},
+    {'nearest_k': {'k': 1}},
+    {'nearest_k': 0},
+    {'nearest_k': 1.5},
+])
+def test_bad_limits_raise_value_error(station_index, filters):
+    with pytest.raises(ValueError):
+        select_stations(station_index, location='Miami', **filters)
+
+
+@pytest.mark.parametrize('coords', [
+    {'latitude': [25], 'longitude': -80},
+    {'latitude': 'nan', 'longitude': -80},
+    {'latitude': 95, 'longitude': -80},
+    {'latitude': 25},
+])
+def test_bad_coordinates_raise_value_error(station_index, coords):
+    with pytest.raises(ValueError):
+        select_stations(station_index, nearest_k=3, **coords)
+
+
+def test_find_nearby_stations_requires_a_limit(station_index):
+    with pytest.raises(ValueError):
+        find_nearby_stations(station_index, 25.7, -80.2)